@@ -0,0 +1,52 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""chunker.py lehakshiv text chunking routine
+
+Copyright (C) <2023>  Giuseppe Marco Randazzo
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+def chunk_spans(buf : bytes, target_words : int = 4096) -> list:
+    """Split a byte buffer into spans of roughly target_words words.
+
+    Scans the buffer once counting spaces and newlines as word
+    boundaries and emits (start, end) byte offsets at ~target_words
+    boundaries. The whole routine is simple typed loops so it compiles
+    to a tight C scan when built with Cython (see setup.py); the
+    pure-Python version is the fallback when the extension is not built.
+
+        Args:
+            buf (bytes): The text to split, utf-8 encoded
+            target_words (int): Approximate number of words per span
+
+        Returns:
+            list: (start, end) byte offset pairs covering the buffer
+    """
+    spans = []
+    n_bytes = len(buf)
+    start = 0
+    words = 0
+    i = 0
+    while i < n_bytes:
+        byte = buf[i]
+        if byte == 0x20 or byte == 0x0A:
+            words += 1
+            if words >= target_words:
+                spans.append((start, i + 1))
+                start = i + 1
+                words = 0
+        i += 1
+    if start < n_bytes:
+        spans.append((start, n_bytes))
+    return spans
@@ -16,45 +16,66 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import asyncio
+import logging
+import os
 import tempfile
 import pathlib
 import shutil
-from flask import (Flask,
+import aiofiles
+import orjson
+from quart import (Quart,
+                   Response,
                    jsonify,
                    make_response,
-                   send_from_directory,
+                   request,
+                   send_file,
 )
+from quart.json.provider import DefaultJSONProvider
+import uvicorn
+from werkzeug.utils import secure_filename
 import text2speak
 
+UNITS = ('bytes', 'KB', 'MB', 'GB', 'TB')
+
 def convert_bytes(size):
     """Convert bytes to an useful size
     """
-    for unit in ['bytes', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f'{size:3.1f} {unit}'
-        size /= 1024.0
-    return size
+    unit_idx = max(0, min(len(UNITS) - 1, (int(size).bit_length() - 1) // 10))
+    return f'{size / (1 << (10 * unit_idx)):3.1f} {UNITS[unit_idx]}'
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider serializing responses with orjson's C encoder
+    """
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes to an object"""
+        return orjson.loads(s)
 
 class LBackend:
     """
-    This module defines a Flask-based backend class, 'LBackend', 
-    designed to manage file operations such as upload, download, removal, 
-    and conversion. The class provides routes for various functionalities.
+    This module defines a Quart-based backend class, 'LBackend',
+    designed to manage file operations such as upload, download, removal,
+    and conversion. The class provides async routes for various
+    functionalities served under uvicorn on an asyncio event loop.
 
     Class: LBackend
     ----------------
-    This class represents the backend service, equipped with methods for 
+    This class represents the backend service, equipped with methods for
     handling file operations.
 
     Attributes:
-        app (Flask): The Flask application instance.
-        work_dir (TemporaryDirectory): 
+        app (Quart): The Quart application instance.
+        work_dir (TemporaryDirectory):
             Temporary directory to store uploaded and converted files.
 
     Methods:
         __init__(self, name)
-            Initializes the LBackend instance with the given name, 
-            creates a Flask app, sets up the work directory, and defines
+            Initializes the LBackend instance with the given name,
+            creates a Quart app, sets up the work directory, and defines
             routes for different operations.
 
         prepare(self)
@@ -79,8 +100,8 @@ class LBackend:
             indicating success or failure.
 
         convert(self, filename)
-            Converts the specified file into audio format. Returns a JSON
-            response indicating the filename to be converted.
+            Converts the specified file into audio format. Streams the
+            audio back with chunked transfer encoding as it is produced.
 
         run(self, host, port)
             Starts the backend server and listens for incoming requests on
@@ -88,7 +109,10 @@ class LBackend:
 
     Routes:
         /: Returns the backend's index page.
-        /upload: Handles file uploads.
+        /upload: Handles multipart file uploads.
+        /upload/<filename>: Handles raw streaming file uploads.
+        /upload/<upload_id>/<idx>: Stores one chunk of a parallel upload.
+        /upload/<upload_id>/finalize: Assembles the chunks of an upload.
         /download/<filename>: Handles file downloads.
         /remove/<filename>: Handles file removal.
         /convert/<filename>: Handles file conversion.
@@ -99,70 +123,108 @@ class LBackend:
     backend.run(host="0.0.0.0", port=8080)
     """
     # pylint: disable=unused-private-member
-    def __init__(self, name) -> None:
+    def __init__(self, name, work_dir=None) -> None:
         """
         Initialize the LBackend instance.
 
         Parameters:
             name (str): Name of the backend.
+            work_dir (str): Directory holding the uploads/converted trees.
+                Defaults to the LEHAKSHIV_WORK_DIR environment variable;
+                when neither is set, a private temporary directory is
+                created. When run() spawns several workers it exports
+                this directory through LEHAKSHIV_WORK_DIR, so every
+                worker's create_app() serves the same file tree.
         """
-        self.app = Flask(name)
-        self.work_dir = tempfile.mkdtemp()
-        print(self.work_dir)
+        self.app = Quart(name)
+        self.app.json = ORJSONProvider(self.app)
+        if work_dir is None:
+            work_dir = os.environ.get('LEHAKSHIV_WORK_DIR')
+        self.shared_work_dir = work_dir is not None
+        if self.shared_work_dir:
+            pathlib.Path(work_dir).mkdir(parents=True, exist_ok=True)
+            self.work_dir = work_dir
+        else:
+            self.work_dir = tempfile.mkdtemp()
+        logging.getLogger(__name__).debug("work dir: %s", self.work_dir)
+        self.uploads_dir = pathlib.Path(self.work_dir) / 'uploads'
+        self.converted_dir = pathlib.Path(self.work_dir) / 'converted'
         self.prepare()
 
         @self.app.route('/')
-        def __index():
+        async def __index():
             """Backend index
             """
             return self.index()
 
         @self.app.route('/upload/', methods=['POST'])
-        def __upload(_request):
+        async def __upload():
             """upload method
             """
-            return self.upload(_request)
+            return await self.upload(request)
+
+        @self.app.route('/upload/<filename>', methods=['POST'])
+        async def __upload_stream(filename):
+            """streaming upload method
+            """
+            return await self.upload_stream(request, filename)
+
+        @self.app.route('/upload/<upload_id>/<int:idx>', methods=['PUT'])
+        async def __upload_chunk(upload_id, idx):
+            """chunked upload method
+            """
+            return await self.upload_chunk(request, upload_id, idx)
+
+        @self.app.route('/upload/<upload_id>/finalize', methods=['POST'])
+        async def __upload_finalize(upload_id):
+            """chunked upload finalize method
+            """
+            return await self.upload_finalize(request, upload_id)
 
         @self.app.route('/download/<filename>', methods=['GET'])
-        def __download(filename):
+        async def __download(filename):
             """download method
             """
-            return self.download(filename)
+            return await self.download(filename)
 
         @self.app.route('/remove/<filename>', methods=['GET'])
-        def __remove(filename):
+        async def __remove(filename):
             """remove method
             """
-            return self.remove(filename)
+            return await self.remove(filename)
 
         @self.app.route('/lsdir/', methods=['GET'])
-        def __list_downloads():
+        async def __list_downloads():
             """download method
             """
-            return self.list_downloads()
+            return await self.list_downloads()
 
         @self.app.route('/convert/<filename>', methods=['GET'])
-        def __convert(filename):
+        async def __convert(filename):
             """convert method
             """
-            return self.convert(filename)
+            return await self.convert(filename)
 
     def close(self):
         """Cleanup"""
-        if pathlib.Path(self.work_dir).exists():
+        os.close(self.uploads_fd)
+        os.close(self.converted_fd)
+        if not self.shared_work_dir and pathlib.Path(self.work_dir).exists():
             shutil.rmtree(self.work_dir)
 
     def prepare(self):
         """Prepare backend data structure"""
-        pathlib.Path(f'{self.work_dir}/uploads').mkdir(exist_ok=True)
-        pathlib.Path(f'{self.work_dir}/converted').mkdir(exist_ok=True)
+        self.uploads_dir.mkdir(exist_ok=True)
+        self.converted_dir.mkdir(exist_ok=True)
+        self.uploads_fd = os.open(self.uploads_dir, os.O_DIRECTORY)
+        self.converted_fd = os.open(self.converted_dir, os.O_DIRECTORY)
 
     def index(self):
         """Return index backend
         """
         return "<h1 style='color:blue'>lehakshiv backend</h1>"
 
-    def upload(self, _request):
+    async def upload(self, _request):
         """
         Upload a file inside the 'uploads' directory.
 
@@ -173,60 +235,172 @@ class LBackend:
             Response: JSON response indicating the success or failure of the upload.
         """
         try:
-            fup = _request.files['file']
-            fup.save(f'{self.work_dir}/uploads')
-            return make_response(jsonify({"message": "upload ok",
-                                          "severity": "INFO"}), 200)
+            files = await _request.files
+            fup = files['file']
+            fname = secure_filename(fup.filename)
+            if not fname:
+                return await make_response(jsonify({"message": "invalid file name",
+                                                    "severity": "ERROR"}),
+                                           400)
+            await fup.save(self.uploads_dir / fname)
+            return await make_response(jsonify({"message": "upload ok",
+                                                "severity": "INFO"}), 200)
         except FileNotFoundError as error_msg:
-            return make_response(jsonify({"message": error_msg,
-                                          "severity": "ERROR"}),
-                                 404)
+            return await make_response(jsonify({"message": str(error_msg),
+                                                "severity": "ERROR"}),
+                                       404)
 
-    def download(self, filename):
+    async def upload_stream(self, _request, filename):
+        """
+        Upload a file by streaming the raw request body to disk.
+
+        Streams the body straight into 'uploads/<filename>' without going
+        through the multipart parser, so memory stays flat and CPU does
+        not burn on form decoding for large files.
+
+        Parameters:
+            _request (Request): Incoming HTTP request carrying the raw file body.
+            filename (str): Name of the destination file.
+
+        Returns:
+            Response: JSON response indicating the success or failure of the upload.
+        """
+        fname = secure_filename(filename)
+        out_path = self.uploads_dir / fname
+        async with aiofiles.open(out_path, 'wb') as f_out:
+            async for chunk in _request.body:
+                await f_out.write(chunk)
+        return await make_response(jsonify({"message": "upload ok",
+                                            "severity": "INFO"}), 200)
+
+    async def upload_chunk(self, _request, upload_id, idx):
+        """
+        Upload one chunk of a multi-chunk upload.
+
+        Chunks for the same upload_id may be sent in parallel, in any
+        order, and to any worker process; each is streamed to
+        'uploads/<upload_id>/<idx>.part' in the shared work dir, which is
+        also where finalize finds them.
+
+        Parameters:
+            _request (Request): Incoming HTTP request carrying the chunk body.
+            upload_id (str): Client-chosen identifier of the upload.
+            idx (int): Zero-based chunk index.
+
+        Returns:
+            Response: JSON response indicating the chunk was stored.
+        """
+        safe_id = secure_filename(upload_id)
+        chunk_dir = self.uploads_dir / safe_id
+        chunk_dir.mkdir(exist_ok=True)
+        async with aiofiles.open(f'{chunk_dir}/{idx}.part', 'wb') as f_out:
+            async for chunk in _request.body:
+                await f_out.write(chunk)
+        return await make_response(jsonify({"message": f"chunk {idx} ok",
+                                            "severity": "INFO"}), 200)
+
+    async def upload_finalize(self, _request, upload_id):
+        """
+        Assemble the chunks of an upload into the final file.
+
+        The '.part' files found on disk are the upload state, so the
+        chunks may have been received by any worker sharing the work
+        dir. Their indices must form a contiguous 0..N-1 set — a missing
+        chunk aborts the assembly instead of producing a corrupt file.
+        Concatenation goes through os.sendfile, so the bytes move
+        between file descriptors in kernel space.
+
+        Parameters:
+            _request (Request): Incoming HTTP request; the 'filename' query
+                parameter names the assembled file (defaults to upload_id).
+            upload_id (str): Identifier of the upload to finalize.
+
+        Returns:
+            Response: JSON response indicating the success or failure of
+            the assembly.
+        """
+        safe_id = secure_filename(upload_id)
+        chunk_dir = self.uploads_dir / safe_id
+        if not chunk_dir.is_dir():
+            return await make_response(jsonify({"message": "unknown upload id",
+                                                "severity": "ERROR"}),
+                                       404)
+        indices = sorted(int(part.stem) for part in chunk_dir.glob('*.part'))
+        if not indices or indices != list(range(len(indices))):
+            return await make_response(jsonify({"message": "missing upload chunks",
+                                                "severity": "ERROR"}),
+                                       409)
+        fname = secure_filename(_request.args.get('filename', safe_id))
+        parts = [f'{chunk_dir}/{idx}.part' for idx in indices]
+        await asyncio.to_thread(text2speak.concat_files,
+                                parts,
+                                self.uploads_dir / fname)
+        shutil.rmtree(chunk_dir)
+        return await make_response(jsonify({"message": f"upload {fname} ok",
+                                            "severity": "INFO"}), 200)
+
+    async def download(self, filename):
         """
         Download a file from the 'downloads' directory.
 
         Parameters:
             filename (str): Name of the file to be downloaded.
 
+        Honors HTTP Range requests (206 + Content-Range), so an
+        interrupted download of a large audio file can be resumed from
+        where it stopped instead of restarting from zero. As in
+        remove(), the file name must be a bare name so a crafted name
+        cannot reach outside the 'converted' directory.
+
         Returns:
-            Response: Response containing the specified file as an attachment, 
+            Response: Response containing the specified file as an attachment,
             or an error response if the file is not found.
         """
+        if '/' in filename or filename in ('.', '..'):
+            return await make_response(jsonify({"message": "invalid file name",
+                                                "severity": "ERROR"}),
+                                       400)
         try:
-            send_from_directory(f'{self.work_dir}',
-                                f'{filename}',
-                                as_attachment=True)
-            return make_response(jsonify({"message": "download ok.",
-                                          "severity": "INFO"}),
-                                 200)
+            return await send_file(self.converted_dir / filename,
+                                   as_attachment=True,
+                                   conditional=True)
         except FileNotFoundError as error_msg:
-            return make_response(jsonify({"message": error_msg,
-                                          "severity": "ERROR"}),
-                                 404)
+            return await make_response(jsonify({"message": str(error_msg),
+                                                "severity": "ERROR"}),
+                                       404)
 
-    def remove(self, filename):
+    async def remove(self, filename):
         """
         Remove a file from both 'uploads' and 'downloads' directories.
 
+        The file name must be a bare name: anything containing a path
+        separator (or '.'/'..') is rejected so a crafted name cannot
+        escape the work directory. Deletion goes through os.unlink with
+        the pre-opened directory file descriptors, a single unlinkat(2)
+        per file with no path walk.
+
         Parameters:
             filename (str): Name of the file to be removed.
 
         Returns:
             Response: JSON response indicating the success or failure of the removal.
         """
+        if '/' in filename or filename in ('.', '..'):
+            return await make_response(jsonify({"message": "invalid file name",
+                                                "severity": "ERROR"}),
+                                       400)
         try:
-            pathlib.Path(f'{self.work_dir}/uploads/{filename}').unlink()
-            pathlib.Path(f'{self.work_dir}/converted/{filename}').unlink()
-            return make_response(jsonify({"message": f"file {filename} removed.",
-                                          "severity": "INFO"}),
-                                          200)
+            os.unlink(filename, dir_fd=self.uploads_fd)
+            os.unlink(filename, dir_fd=self.converted_fd)
+            return await make_response(jsonify({"message": f"file {filename} removed.",
+                                                "severity": "INFO"}),
+                                       200)
         except FileNotFoundError as error_msg:
-            return make_response(jsonify({"message": error_msg,
-                                          "severity": "ERROR"}),
-                                 404)
+            return await make_response(jsonify({"message": str(error_msg),
+                                                "severity": "ERROR"}),
+                                       404)
 
-    def list_downloads(self,):
+    async def list_downloads(self,):
         """
         List the contents of the 'downloads' folder.
 
@@ -237,42 +411,101 @@ class LBackend:
         Returns:
             Flask Response: JSON response containing folder contents or an error message.
         """
-        full_path = pathlib.Path(f'{self.work_dir}/converted')
-        print(full_path)
+        full_path = self.converted_dir
         if full_path.exists() is False:
-            return make_response(jsonify({"message": "folder not found!",
-                                          "severity": "ERROR"}),
-                                          404)
-        folder_contents = []
-        for f_found in full_path.glob('**/*'):
-            print(f_found)
-            if f_found.is_file():
-                folder_contents.append(
-                    {"file": str(f_found.name),
-                     "size": convert_bytes(f_found.stat().st_size)})
-            else:
-                continue
-        print(folder_contents)
-        return make_response(jsonify(folder_contents), 200)
-
-    def convert(self, filename):
+            return await make_response(jsonify({"message": "folder not found!",
+                                                "severity": "ERROR"}),
+                                       404)
+        with os.scandir(full_path) as entries:
+            folder_contents = [
+                {"file": entry.name,
+                 "size": convert_bytes(entry.stat().st_size)}
+                for entry in entries if entry.is_file()]
+        return await make_response(jsonify(folder_contents), 200)
+
+    async def convert(self, filename):
         """
-        Convert the specified file into audio format.
+        Convert the specified file into audio format and stream it back.
+
+        The response body uses chunked transfer encoding: each audio
+        chunk is sent as soon as it has been synthesized, so playback
+        can start before the whole conversion is done. The merged audio
+        file is also stored in 'converted' for later download.
 
         Parameters:
             filename (str): Name of the file to be converted.
 
         Returns:
-            Response: JSON response indicating the filename to be converted.
+            Response: Streaming audio response, or an error response if
+            the file extension is not supported.
         """
-        lt2s = text2speak.LText2Speak(f'{self.work_dir}/uploads',
-                                      f'{self.work_dir}/converted')
-        audio_file = lt2s.get_audio_file(filename)
-        return make_response(jsonify(audio_file))
-
-    def run(self, host, port):
-        """Run the backend"""
-        self.app.run(host=host, port=port)
+        ext = pathlib.Path(filename).suffix[1:].lower()
+        if ext not in ('pdf', 'txt'):
+            return await make_response(jsonify({"message": f"unable to convert {filename}",
+                                                "severity": "ERROR"}),
+                                       404)
+        if not (self.uploads_dir / filename).is_file():
+            return await make_response(jsonify({"message": f"file {filename} not found!",
+                                                "severity": "ERROR"}),
+                                       404)
+        lt2s = text2speak.LText2Speak(self.uploads_dir,
+                                      self.converted_dir)
+        chunk_dir = await asyncio.to_thread(tempfile.mkdtemp,
+                                            dir=self.uploads_dir)
+        chunk_iter = lt2s.iter_audio_chunks(filename, chunk_dir)
+        audio_name = f'{pathlib.Path(filename).stem}.mp3'
+
+        async def stream_chunks():
+            chunks = []
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(next, chunk_iter, None)
+                    if chunk is None:
+                        break
+                    chunks.append(chunk)
+                    async with aiofiles.open(chunk, 'rb') as f_chunk:
+                        while True:
+                            block = await f_chunk.read(1 << 16)
+                            if not block:
+                                break
+                            yield block
+                await asyncio.to_thread(lt2s.merge_audio_files,
+                                        chunks,
+                                        f'{self.converted_dir}/{audio_name}')
+            finally:
+                await asyncio.to_thread(shutil.rmtree, chunk_dir)
+
+        return Response(stream_chunks(), mimetype='audio/mpeg')
+
+    def run(self, host, port, workers=None):
+        """Run the backend.
+
+        Parameters:
+            host (str): Interface to bind.
+            port (int): Port to listen on.
+            workers (int): Number of worker processes. Defaults to
+                2 * cores + 1 when a shared work dir is configured (see
+                __init__), otherwise 1: each uvicorn worker builds its
+                own app from the create_app factory, so without a shared
+                work dir every worker would serve a private file tree.
+        """
+        if workers is None:
+            workers = 2 * os.cpu_count() + 1 if self.shared_work_dir else 1
+        if workers > 1:
+            os.environ['LEHAKSHIV_WORK_DIR'] = str(self.work_dir)
+            uvicorn.run('lbackend:create_app', factory=True,
+                        host=host, port=port, workers=workers, loop="uvloop")
+        else:
+            uvicorn.run(self.app, host=host, port=port,
+                        workers=1, loop="uvloop")
+
+def create_app():
+    """Application factory used by each uvicorn worker process.
+
+    Workers share files through the work dir named by the
+    LEHAKSHIV_WORK_DIR environment variable.
+    """
+    return LBackend(__name__).app
 
 if __name__ == '__main__':
     server = LBackend(__name__)
@@ -19,6 +19,20 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import PyPDF2
 
+def iter_text(in_pdf: str):
+    """iterate over the text of a pdf file page by page
+
+        Args:
+            in_pdf (str): The input file name
+
+        Yields:
+            str: The extracted text of one page
+    """
+    with open(in_pdf,'rb') as pdfobj:
+        pdfreader=PyPDF2.PdfFileReader(pdfobj)
+        for page in range(pdfreader.numPages):
+            yield pdfreader.getPage(page).extractText()
+
 def pdf2txt(in_pdf: str, out_txt : str) -> None:
     """convert a pdf into a txt file
 
@@ -27,10 +41,6 @@ def pdf2txt(in_pdf: str, out_txt : str) -> None:
             out_pdf (str): The output txt file name
 
     """
-    with open(in_pdf,'rb') as pdfobj:
-        pdfreader=PyPDF2.PdfFileReader(pdfobj)
-        num_pages=pdfreader.numPages
-        pageobj=pdfreader.getPage(num_pages+1)
-        text=pageobj.extractText()
-        with open(out_txt, "w", encoding="utf-8") as f_out:
-            f_out.writelines(text)
+    with open(out_txt, "w", encoding="utf-8") as f_out:
+        for text in iter_text(in_pdf):
+            f_out.write(text)
@@ -16,14 +16,115 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import io
 import pathlib
 import logging
 import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import pyttsx3
+import chunker
 import pdf2txt
 import textcleaner
 
 
+def concat_files(parts : list, out_name : str):
+    """Concatenate files into out_name.
+
+    Moves the bytes between file descriptors with os.sendfile, looping
+    on the returned count because a single call may transfer less than
+    requested (Linux caps one call at about 2 GiB). Falls back to
+    shutil.copyfileobj only when sendfile transferred nothing, so a
+    partial kernel copy is never duplicated.
+
+    Args:
+        parts (list): File paths to concatenate, in order.
+        out_name (str): Path of the concatenated output file.
+    """
+    with open(out_name, 'wb') as f_dst:
+        dst_fd = f_dst.fileno()
+        for part in parts:
+            with open(part, 'rb') as f_src:
+                size = os.fstat(f_src.fileno()).st_size
+                offset = 0
+                try:
+                    while offset < size:
+                        sent = os.sendfile(dst_fd, f_src.fileno(),
+                                           offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                except (AttributeError, OSError):
+                    if offset > 0:
+                        raise
+                    shutil.copyfileobj(f_src, f_dst, length=1 << 20)
+
+
+_WORKER_TTS = None
+
+def get_tts():
+    """Return the process-local TTS engine, creating it on first use.
+
+    pyttsx3.init forks the speech driver, so the engine is built once
+    per worker process and reused for every chunk it synthesizes.
+    """
+    global _WORKER_TTS  # pylint: disable=global-statement
+    if _WORKER_TTS is None:
+        _WORKER_TTS = TTS()
+    return _WORKER_TTS
+
+
+def synthesize(job):
+    """Synthesize one text chunk into an audio file.
+
+    Module-level so it can run inside a worker process; each process
+    caches its own TTS engine because pyttsx3 engines are not picklable.
+
+    Args:
+        job (tuple): (text, out_audio) pair to synthesize.
+    """
+    text, out_audio = job
+    get_tts().text2mp3(text, out_audio)
+
+
+def iter_chunks(pieces, words=4096):
+    """Group text pieces into chunks of roughly `words` words.
+
+    Yields each (idx, text) chunk as soon as it is complete, so chunk k
+    can be synthesized while the next pieces are still being extracted.
+    A whole document already in memory can be passed as a single bytes
+    blob, in which case the boundaries are found by chunker.chunk_spans
+    in one compiled scan instead of the per-piece Python loop.
+
+    Args:
+        pieces (iterable or bytes): Text pieces (lines, pages, ...) in
+            order, or the whole utf-8 encoded document as bytes.
+        words (int): Approximate number of words per chunk.
+
+    Yields:
+        tuple: (idx, text) pair for each chunk.
+    """
+    if isinstance(pieces, (bytes, bytearray)):
+        for i, (start, end) in enumerate(chunker.chunk_spans(pieces, words)):
+            yield i, pieces[start:end].decode('utf-8')
+        return
+    buf = io.StringIO()
+    word_count = 0
+    i = 0
+    for piece in pieces:
+        buf.write(piece)
+        word_count += piece.count(' ') + 1
+        if word_count >= words:
+            yield i, buf.getvalue()
+            buf = io.StringIO()
+            word_count = 0
+            i += 1
+    if buf.tell() > 0:
+        yield i, buf.getvalue()
+
+
 class TTS:
     """ pyttsx class to solve the hangs in runAndWait problem"""
     def __init__(self):
@@ -70,51 +171,92 @@ class LText2Speak:
         """
         Initialize the LText2Speak instance.
 
-        Initializes the text-to-speech engine using the 'pyttsx3' library.
+        No engine is created here: synthesis runs in the pool workers,
+        each of which caches its own TTS engine (see get_tts).
         """
-        self.tts = TTS()
         self.in_work_dir = in_work_dir
         self.out_work_dir = out_work_dir
 
     def get_audio_file(self, file_name : str) -> str:
         """
-        Convert text to speech and save as a txt file.
+        Convert a file to speech and save as an audio file.
 
-        This method processes the input by converting him into a txt files
+        The input text is split in ~4096-word chunks which are synthesized
+        in parallel across worker processes and then merged in order into
+        a single audio file.
 
         Args:
             file (str): The input file name
 
         Returns:
-            str: The name of the output txt converted file
+            str: The name of the output audio file
+        """
+        chunk_dir = tempfile.mkdtemp(dir=self.in_work_dir)
+        try:
+            try:
+                chunks = list(self.iter_audio_chunks(file_name, chunk_dir))
+            except ValueError as error_msg:
+                logging.error(str(error_msg))
+                return -1
+            audio_name = f'{pathlib.Path(file_name).stem}.mp3'
+            self.merge_audio_files(chunks, f'{self.out_work_dir}/{audio_name}')
+            return audio_name
+        finally:
+            shutil.rmtree(chunk_dir)
+
+    def iter_audio_chunks(self, file_name : str, chunk_dir : str):
+        """
+        Synthesize a file and yield each audio chunk path in order.
+
+        Chunks are submitted to the process pool as they are extracted
+        and yielded as soon as they are ready, so the caller can start
+        consuming audio while later chunks are still being synthesized.
+        At most one chunk text per worker is in flight at a time, so
+        extraction never races ahead of synthesis and the whole document
+        is never held in memory at once.
+
+        Args:
+            file_name (str): The input file name
+            chunk_dir (str): Directory for this conversion's chunk files;
+                created and removed by the caller, so concurrent
+                conversions never clobber each other's chunks.
+
+        Yields:
+            str: The path of each synthesized audio chunk, in order
+
+        Raises:
+            ValueError: If the file extension is not supported.
         """
         ext = pathlib.Path(f'{self.in_work_dir}/{file_name}').suffix[1:].lower()
         in_file = f'{self.in_work_dir}/{file_name}'
-        out_file = f'{self.in_work_dir}/{file_name.replace(".pdf", ".txt")}'
         if ext == "pdf":
-            pdf2txt.pdf2txt(in_file, out_file)
+            pieces = pdf2txt.iter_text(in_file)
         elif ext == "txt":
-            textcleaner.cleantext(in_file, out_file)
+            pieces = textcleaner.iter_clean(in_file)
         else:
-            logging.error("unable to covert the following extension %s", (ext))
-            return -1
-        chunks = []
-        with open(out_file, "r", encoding="utf-8") as f_txt:
-            text = ""
-            i = 0
-            for line in f_txt:
-                if len(text.split(" ")) < 4096:
-                    text += line
-                else:
-                    chunks.append(f'{self.in_work_dir}/{6:i}.mp3')
-                    self.tts.text2mp3(text, chunks[-1])
-                    text = line
-                    i += 1
-        return 0
+            raise ValueError(f'unable to covert the following extension {ext}')
+        max_inflight = os.cpu_count()
+        with ProcessPoolExecutor(max_workers=max_inflight) as executor:
+            pending = deque()
+            for i, text in iter_chunks(pieces):
+                if len(pending) >= max_inflight:
+                    chunk, future = pending.popleft()
+                    future.result()
+                    yield chunk
+                chunk = f'{chunk_dir}/{i}.mp3'
+                pending.append((chunk,
+                                executor.submit(synthesize, (text, chunk))))
+            while pending:
+                chunk, future = pending.popleft()
+                future.result()
+                yield chunk
 
     def merge_audio_files(self, chunks : list, out_name : str):
         """
-        Convert text to speech and save as an audio file.
+        Merge the audio chunks into a single audio file.
+
+        Concatenates the chunk files in order with concat_files, moving
+        the bytes between file descriptors in kernel space instead of
+        forking a shell and copying through user-space buffers.
         """
-        cat_str = "cat "+" ".join(chunks)+" > "+f'{out_name}'
-        os.system(cat_str)
+        concat_files(chunks, out_name)
@@ -16,11 +16,22 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import shutil
+
+def iter_clean(in_txt : str):
+    """
+    Iterate over a txt file yielding cleaned lines
+    """
+    with open(in_txt, "r", encoding="utf-8") as f_inp:
+        for line in f_inp:
+            yield line
+
 def cleantext(in_txt : str, out_txt : str):
     """
     Clean txt file removing unwanted worlds
+
+    No cleaning rules are defined yet, so the output is a byte-for-byte
+    copy done with shutil.copyfile (sendfile/fcopyfile in kernel space)
+    instead of decoding and re-encoding the file one line at a time.
     """
-    with open(in_txt, "r", encoding="utf-8") as f_inp:
-        with open(out_txt, "w", encoding="utf-8") as f_out:
-            for line in f_inp:
-                f_out.write(line)
+    shutil.copyfile(in_txt, out_txt)
@@ -0,0 +1,27 @@
+"""setup.py lehakshiv build script
+
+Copyright (C) <2023>  Giuseppe Marco Randazzo
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['lehakshiv/chunker.py'], language_level=3)
+except ImportError:
+    ext_modules = []
+
+setup(ext_modules=ext_modules)